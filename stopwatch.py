@@ -10,14 +10,23 @@ tariq.shihadah@gmail.com
 """
 
 
+__all__ = ['Stopwatch', 'stopwatch', 'timed_loop', 'report_many', 's_to_hms',
+           'hms_to_s']
+
+
 ################
 # DEPENDENCIES #
 ################
 
 
 import time
-from statistics import mean, median, stdev
-from tarpy.util.general import chunkit, infinite_count
+from array import array
+from functools import lru_cache
+from itertools import islice
+from math import sqrt
+from string import Formatter
+from types import FunctionType
+from tarpy.util.general import infinite_count
 
 
 #############
@@ -25,6 +34,10 @@ from tarpy.util.general import chunkit, infinite_count
 #############
 
 
+# Most recent default-format report of the current time and its second
+_now_cache = [0, '']
+
+
 class Stopwatch(object):
     """
     A functional, stopwatch-like tool with the ability to report time passed 
@@ -57,6 +70,7 @@ class Stopwatch(object):
     Methods
     -------
     :laps:      returns a list of lap times for all completed laps
+    :laps_str:  returns a single string of lap times for all completed laps
     :check:     returns the total elapsed time on the stopwatch
     :lap:       returns the total elapsed time for the current lap and begins
                 a new lap
@@ -96,6 +110,23 @@ class Stopwatch(object):
                 perform timing operations
     :hits:      returns the number of hits on the stopwatch
     """
+    __slots__ = (
+        # Timing
+        '_resource', '_tick', '_unit', '_pause', '_start', '_split', 
+        '_check', '_lap', '_hits', '_less', '_lap_less', '_break_loop',
+        # Lap records and running lap statistics
+        '_laps', '_n', '_mean', '_m2', '_min', '_max', '_median',
+        # Reporting
+        '_numeric', '_hms', '_form', '_process', '_has_process', '_reporter',
+        # Allow weak references to stopwatches
+        '__weakref__',
+    )
+    # Maximum number of lap records pre-sized for timed loops
+    _presize = 4096
+    # Default reporting formats
+    _form_hms = "{0:.0f}:{1:02.0f}:{2:05.2f}"
+    _form_s = "{0:.2f}"
+
     def __init__(self, start=True, numeric=False, hms=True, form=None, 
                  process=None, resource='perf_counter'):
         # Get timing resource
@@ -105,37 +136,91 @@ class Stopwatch(object):
             raise AttributeError("""Please select a timing resource from the \
 list of default options: {'perf_counter', 'monotonic', 'process_time', \
 'time'}.""")
+        # Cache the timing function for use in the tick path, preferring its 
+        # integer nanosecond variant where one is available
+        try:
+            self._tick = getattr(time, resource + '_ns')
+            self._unit = 1e9
+        except AttributeError:
+            self._tick = self._resource
+            self._unit = 1
         # Initialize attributes
+        self._laps = array('d')
         self.reset(start=start)
         # Set default time reporting format
-        self.numeric = numeric
-        self.hms = hms
-        self.process = process
+        self._numeric = numeric
+        self._hms = hms
+        self._process = process
         if hms:
             if form is None:
-                self.form = "{0:.0f}:{1:02.0f}:{2:05.2f}"
+                self._form = self._form_hms
             else:
-                self.form = form
+                self._form = form
         else:
             if form is None:
-                self.form = "{0:.2f}"
+                self._form = self._form_s
             else:
-                self.form = form
+                self._form = form
+        # Specialize the default reporter to the reporting format
+        self._compile_reporter()
                 
     def __str__(self):
         return str(self.check(numeric=False))
     
+    def __getstate__(self):
+        # Leave out the generated reporter, which is rebuilt on restore
+        state = dict(getattr(self, '__dict__', {}))
+        for name in Stopwatch.__slots__:
+            if not name in ('_reporter', '__weakref__') and \
+                    hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+    
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._compile_reporter()
+    
     @property
     def resource(self):
         return self._resource
     
     @property
-    def _time(self):
-        if self._pause:
-            return self._pause
-        else:
-            return self._resource()
-        
+    def numeric(self):
+        return self._numeric
+    
+    @numeric.setter
+    def numeric(self, numeric):
+        self._numeric = numeric
+        self._compile_reporter()
+    
+    @property
+    def hms(self):
+        return self._hms
+    
+    @hms.setter
+    def hms(self, hms):
+        self._hms = hms
+        self._compile_reporter()
+    
+    @property
+    def form(self):
+        return self._form
+    
+    @form.setter
+    def form(self, form):
+        self._form = form
+        self._compile_reporter()
+    
+    @property
+    def process(self):
+        return self._process
+    
+    @process.setter
+    def process(self, process):
+        self._process = process
+        self._compile_reporter()
+    
     @property
     def active(self):
         return not bool(self._pause)
@@ -145,11 +230,45 @@ list of default options: {'perf_counter', 'monotonic', 'process_time', \
         return bool(self._pause)
     
     @property
-    def hits(self, **kwargs):
+    def hits(self):
         return self._hits
     
-    def laps(self, **kwargs):
-        return [self._report(lap, **kwargs) for lap in self._laps]
+    def laps(self, printit=False, numeric=None, hms=None, form=None, 
+             **kwargs):
+        # Report with the compiled reporter if no formatting info is provided
+        if not printit and numeric is None and hms is None and form is None:
+            reporter = self._reporter
+            return [reporter(lap) for lap in self._laps[:self._n]]
+        # Report through the full reporting path if printing or processing
+        if printit or self._has_process:
+            return [self._report(lap, printit=printit, numeric=numeric, 
+                                 hms=hms, form=form)
+                    for lap in self._laps[:self._n]]
+        # Otherwise resolve the formatting info once for all laps
+        if numeric is None:
+            numeric = self._numeric
+        if hms is None:
+            hms = self._hms
+        if form is None:
+            form = self._form
+        unit = self._unit
+        return [_format_delta(lap / unit, numeric, hms, form)
+                for lap in self._laps[:self._n]]
+    
+    def laps_str(self, sep='\n'):
+        """
+        Return the lap times for all completed laps in the stopwatch's 
+        reporting format as a single string.
+        
+        Parameters
+        ----------
+        :sep:       `string, default '\\n'` the separator to place between 
+                    reported lap times
+        """
+        # Join formatted reports directly from the compiled reporter
+        if not self._numeric and not self._has_process:
+            return sep.join(map(self._reporter, self._laps[:self._n]))
+        return sep.join([str(lap) for lap in self.laps()])
     
     def stats(self, **kwargs):
         """
@@ -164,7 +283,7 @@ Median: {}
 Mean:   {}
 Stdev.: {}
 --------------
-""".format(len(self._laps), self.minlap(), self.maxlap(), self.medianlap(),
+""".format(self._n, self.minlap(), self.maxlap(), self.medianlap(),
            self.meanlap(), self.stdevlap()))
     
     def lastlap(self, **kwargs):
@@ -175,10 +294,12 @@ Stdev.: {}
         -------
         a report of the maximum of lap lengths
         """
-        if len(self._laps) < 1:
+        if self._n < 1:
             val = 0
         else:
-            val = self._laps[-1]
+            val = self._laps[self._n - 1]
+        if not kwargs:
+            return self._reporter(val)
         return self._report(val, **kwargs)
     
     def maxlap(self, **kwargs):
@@ -189,10 +310,10 @@ Stdev.: {}
         -------
         a report of the maximum of lap lengths
         """
-        if len(self._laps) < 1:
+        if self._n < 1:
             val = 0
         else:
-            val = max(self._laps)
+            val = self._max
         return self._report(val, **kwargs)
     
     def minlap(self, **kwargs):
@@ -203,10 +324,10 @@ Stdev.: {}
         -------
         a report of the minimum of lap lengths
         """
-        if len(self._laps) < 1:
+        if self._n < 1:
             val = 0
         else:
-            val = min(self._laps)
+            val = self._min
         return self._report(val, **kwargs)
     
     def meanlap(self, **kwargs):
@@ -217,10 +338,10 @@ Stdev.: {}
         -------
         a report of the mean of lap lengths
         """
-        if len(self._laps) < 1:
+        if self._n < 1:
             val = 0
         else:
-            val = mean(self._laps)
+            val = self._mean
         return self._report(val, **kwargs)
     
     def medianlap(self, **kwargs):
@@ -231,11 +352,25 @@ Stdev.: {}
         -------
         a report of the median of lap lengths
         """
-        if len(self._laps) < 1:
-            val = 0
-        else:
-            val = median(self._laps)
-        return self._report(val, **kwargs)
+        return self._report(self._median_raw(), **kwargs)
+    
+    def _median_raw(self):
+        """
+        Return the median lap length in the units of the timing function. Lap 
+        records are only sorted when the median is requested, and the result 
+        is kept until another lap is logged.
+        """
+        n = self._n
+        if self._median[0] != n:
+            laps = sorted(self._laps[:n])
+            if n < 1:
+                val = 0
+            elif n % 2:
+                val = laps[n // 2]
+            else:
+                val = (laps[n // 2 - 1] + laps[n // 2]) / 2
+            self._median = (n, val)
+        return self._median[1]
     
     def stdevlap(self, **kwargs):
         """
@@ -245,13 +380,13 @@ Stdev.: {}
         -------
         a report of the standard deviation of lap lengths
         """
-        if len(self._laps) < 1:
+        if self._n < 2:
             val = 0
         else:
-            val = stdev(self._laps)
+            val = sqrt(self._m2 / (self._n - 1))
         return self._report(val, **kwargs)
     
-    def check(self, start=False, pause=False, **kwargs):
+    def check(self, start=False, pause=False, stamp=None, **kwargs):
         """
         Return the amount of active time passed.
         
@@ -261,21 +396,37 @@ Stdev.: {}
                     upon calling the function if it is not already active
         :pause:     `boolean` whether to automatically pause the stopwatch  
                     upon calling the function if it is not already active
+        :stamp:     `numeric, default None` a time stamp from the timing 
+                    resource (see the resource property) to measure active 
+                    time up to, instead of the current time
     
         Returns
         -------
         a report of the total elapsed active time
         """
         # Pause or start stopwatch if requested
-        self.pause(pause)
-        self.start(start)
+        if pause or start:
+            self.pause(pause)
+            self.start(start)
 
         # Get amount of active time passed
-        stamp = kwargs.get('stamp', self._time)
-        self._check = stamp - self._start - self._less
+        if not stamp is None:
+            # Convert the stamp to the units of the timing function
+            self._check = stamp * self._unit - self._start - self._less
+        else:
+            self._check = self._check_numeric()
         
+        if not kwargs:
+            return self._reporter(self._check)
         return self._report(self._check, **kwargs)
     
+    def _check_numeric(self):
+        """
+        Return the amount of active time passed in raw, unreported form, in 
+        the units of the timing function.
+        """
+        return (self._pause or self._tick()) - self._start - self._less
+    
     def lap(self, printit=False, start=False, pause=False, log=True, 
             check=False, form=None, **kwargs):
         """
@@ -304,31 +455,69 @@ Stdev.: {}
         requested
         """
         # Pause or start stopwatch if requested
-        self.pause(pause)
-        self.start(start)
+        if pause or start:
+            self.pause(pause)
+            self.start(start)
             
         # Get split and lap times
-        get_split = self._time
+        get_split = self._pause or self._tick()
         get_lap = get_split - self._split - self._lap_less
         
         # Log lap time (if the timer is running or if it is paused but elapsed
         # time is greater than zero)
         if log and (not self._pause or get_lap > 0):
-            self._laps.append(get_lap)
-            self._lap = get_lap
-            self._split = get_split
-            self._lap_less = 0 # Remove lap subtractions
+            self._log_lap(get_lap, get_split)
         
-        # Report
-        res = (self._report(get_lap, **kwargs), self.check(stamp=get_split))
-        if printit:
-            if form is None:
-                form='Lap Time: {l}; \tTotal Time: {c}'
-            print(form.format(l=res[0], c=res[1]))
-        elif check:
-            return res
+        # Report, only checking total time if it will be used
+        if printit or check:
+            self._check = get_split - self._start - self._less
+            res = (self._report(get_lap, **kwargs),
+                   self._reporter(self._check))
+            if printit:
+                if form is None:
+                    form='Lap Time: {l}; \tTotal Time: {c}'
+                print(form.format(l=res[0], c=res[1]))
+            else:
+                return res
+        elif not kwargs:
+            return self._reporter(get_lap)
         else:
-            return res[0]
+            return self._report(get_lap, **kwargs)
+    
+    def _lap_fast(self):
+        """
+        Split and log the current lap without any reporting, returning the 
+        raw lap time. Used internally where lap reports would be discarded.
+        """
+        get_split = self._pause or self._tick()
+        get_lap = get_split - self._split - self._lap_less
+        if not self._pause or get_lap > 0:
+            self._log_lap(get_lap, get_split)
+        return get_lap
+    
+    def _log_lap(self, get_lap, get_split):
+        """
+        Log the given lap time and split time stamp, updating running lap 
+        statistics.
+        """
+        # Fill pre-sized lap records where available
+        n = self._n
+        if n < len(self._laps):
+            self._laps[n] = get_lap
+        else:
+            self._laps.append(get_lap)
+        # Update running lap statistics (Welford's online algorithm)
+        self._n = n = n + 1
+        delta = get_lap - self._mean
+        self._mean = mean = self._mean + delta / n
+        self._m2 += delta * (get_lap - mean)
+        if get_lap < self._min:
+            self._min = get_lap
+        if get_lap > self._max:
+            self._max = get_lap
+        self._lap = get_lap
+        self._split = get_split
+        self._lap_less = 0 # Remove lap subtractions
     
     def check_after(self, after=None, printit=False, start=False, pause=False, 
                   **kwargs):
@@ -354,7 +543,7 @@ Stdev.: {}
         self.pause(pause)
         self.start(start)
 
-        self.hit(**kwargs)
+        self.hit(kwargs.pop('hits', 1))
         if self._hits % after == 0:
             res = self.check(**kwargs)
             if printit:
@@ -400,7 +589,7 @@ Stdev.: {}
         self.pause(pause)
         self.start(start)
 
-        self.hit(**kwargs)
+        self.hit(kwargs.pop('hits', 1))
         if self._hits % after == 0:
             res = self.lap(log=log, check=True, **kwargs)
             if printit:
@@ -419,7 +608,7 @@ dictionary of formatting keys and inputs""")
         else:
             return None
         
-    def hit(self, hits=1, **kwargs):
+    def hit(self, hits=1):
         """
         Increase the number of hits on the stopwatch by one or a given number.
 
@@ -447,7 +636,7 @@ dictionary of formatting keys and inputs""")
             # Check if the stopwatch is currently active
             if not self._pause:
                 # Set pause time as current time (True)
-                self._pause = self._time
+                self._pause = self._tick()
         
     def start(self, startit=True):
         """
@@ -461,8 +650,9 @@ dictionary of formatting keys and inputs""")
             # Check if the stopwatch is currently paused
             if self._pause:
                 # Update pause subtractions
-                self._less += self._resource() - self._pause
-                self._lap_less += self._resource() - self._pause
+                delta = self._tick() - self._pause
+                self._less += delta
+                self._lap_less += delta
             # Set pause time to zero (False)
             self._pause = 0
     
@@ -480,7 +670,7 @@ dictionary of formatting keys and inputs""")
         None
         """
         # Get start time
-        _start = kwargs.get('_start', self._resource())
+        _start = kwargs.get('_start', self._tick())
         _less = kwargs.get('_less', 0)
         self._start = self._split = _start
         self._check = 0
@@ -493,8 +683,15 @@ dictionary of formatting keys and inputs""")
             self._pause = _start
         self._less = _less
         self._lap_less = 0
-        # Reset records
-        self._laps = []
+        # Reset records in place
+        del self._laps[:]
+        # Reset running lap statistics
+        self._n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = float('inf')
+        self._max = float('-inf')
+        self._median = (0, 0)
         # Reset operational values
         self._break_loop = False
     
@@ -518,7 +715,9 @@ dictionary of formatting keys and inputs""")
             result = func(*args, **kwargs)
             if report: print("Operation time: {}".format(
                     self.lap(pause=True)))
-            else: self.lap(pause=True)
+            else:
+                self.pause()
+                self._lap_fast()
             return result
         return wrapper
     
@@ -543,33 +742,13 @@ dictionary of formatting keys and inputs""")
         -----
         iterable values
         """
-        # Initialize
-        self._break_loop = False
+        every = _chunk_size(every)
+        self._begin_loop(iterable, every, report)
         
-        # Divide iterable into chunks of input size
-        if every is None:
-            every = 1
-        else:
-            try:
-                every = int(every)
-                if every < 1:
-                    raise ValueError("The 'every' parameter must be > 0")
-            except:
-                raise TypeError("The 'every' parameter must be an integer")
-        chunks = chunkit(iterable, size=every)
-        if report:
-            try:
-                i = len(iterable)
-            except:
-                i = 0
-                for chunk in chunks:
-                    i += len(chunk)
-            j = len(chunks)
-            print("Begin loop timer ({} items in {} chunks).".format(i, j))
-        self.reset(start=False) # Reset stopwatch
-        
-        # Iterate over chunks of input iterable
-        for i, chunk in enumerate(chunks):
+        # Iterate over chunks of input iterable, timing the fetching of each 
+        # chunk as part of its lap
+        self.start()
+        for i, chunk in enumerate(_ichunks(iterable, every)):
             # Iterate and yield items within the chunk
             self.start()
             for j, x in enumerate(chunk):
@@ -577,18 +756,49 @@ dictionary of formatting keys and inputs""")
                 if self._break_loop: break
                 
             # Log/report times
-            if report: print("""\
-Items: {:,.0f} - {:,.0f} \tSplit time: {} \tTotal time: {}\
-""".format(i*every+1, i*every+j+1, *self.lap(check=True)))
-            else: self.lap()
+            self._end_chunk(i*every+1, i*every+j+1, report)
             if self._break_loop: break
         
         if report: print("End loop timer.")
+    
+    def _begin_loop(self, iterable, every, report):
+        """
+        Prepare the stopwatch for timing a loop over the given iterable in 
+        chunks of the given size, printing the opening report if requested.
+        """
+        # Initialize
+        self._break_loop = False
+        try:
+            i = len(iterable)
+            j = -(-i // every)
+        except (TypeError, OverflowError):
+            i = j = None
+        if report:
+            if j is None:
+                print("Begin loop timer.")
+            else:
+                print("Begin loop timer ({} items in {} chunks).".format(i, j))
+        self.reset(start=False) # Reset stopwatch
+        if not j is None:
+            # Pre-size lap records, bounded since loops may be cut off early
+            self._laps = array('d', [0.0]) * min(j, self._presize)
+    
+    def _end_chunk(self, first, last, report):
+        """
+        Log the lap for a completed chunk of loop items, numbered from first 
+        to last, printing a report of it if requested.
+        """
+        if report: print("""\
+Items: {:,.0f} - {:,.0f} \tSplit time: {} \tTotal time: {}\
+""".format(first, last, *self.lap(check=True)))
+        else: self._lap_fast()
         
-    def timed_loop(self, iterable=None, s=0, m=0, h=0, cutoff=0, **kwargs):
+    def timed_loop(self, iterable=None, s=0, m=0, h=0, cutoff=0, every=None,
+                   report=False):
         """
         Iterate the given iterable for a fixed amount of time before cutting
-        it off.
+        it off. Each chunk of iterated items is logged as a lap, as with the 
+        loop_timer method.
         
         Parameters
         ----------
@@ -604,45 +814,35 @@ Items: {:,.0f} - {:,.0f} \tSplit time: {} \tTotal time: {}\
                     to avoid over-running expiration time based on the 
                     expected time of the next lap, estimating based on the 
                     last, mean, median, or max lap time
-        :kwargs:    keyword arguments passed to the loop_timer method
+        :every:     `integer, default 1` the number of iterated items to be 
+                    evaluated in each lap and expiration check
+        :report:    `boolean, default False` whether to print split time 
+                    reports for the iteration of each chunk of items
                     
-        Yield
-        -----
-        iterable values
+        Returns
+        -------
+        an iterator of iterable values
         """
         # Compute expiration time
         timer = s + 60*m + 3600*h
-        # Define cutoff method options
-        every = kwargs.get('every', 1)
-        cutoff_ops = {1:'lastlap', 2:'meanlap', 3:'medianlap', 4: 'maxlap'}
+        # Define cutoff options, estimating the next lap from raw lap 
+        # statistics rather than from reports, which may be processed
+        cutoff_ops = {0: None, 
+                      1: lambda: self._laps[self._n - 1] if self._n else 0, 
+                      2: lambda: self._mean, 
+                      3: self._median_raw, 
+                      4: lambda: self._max if self._n else 0}
+        try:
+            cutoff_fn = cutoff_ops[cutoff]
+        except (KeyError, TypeError):
+            raise ValueError("Invalid cutoff option.")
         
         # If no iterable given, create infinite generator
         if iterable is None:
             iterable = infinite_count()
-            
-        # Iterate
-        for i, x in enumerate(self.loop_timer(iterable, **kwargs)):
-            # Yield next value
-            yield x
-            
-            # Check for end of chunk
-            if (i) % every == 0:
-                
-                # Check for expiration
-                elapsed = self.check(numeric=True, hms=False)
-                if cutoff == 0:
-                    if elapsed >= timer:
-                        self._break_loop = True
-                
-                # Check if there is time for another lap before expiration
-                else:
-                    try:
-                        func = getattr(self, cutoff_ops[cutoff])
-                        x = func(numeric=True, hms=False)
-                        if elapsed + x*every > timer:
-                            self._break_loop = True
-                    except:
-                        raise ValueError("Invalid cutoff option.")            
+        
+        return _TimedLoopIter(self, iterable, _chunk_size(every), timer,
+                              cutoff_fn, report)
                 
     def sync(self, *sws):
         """
@@ -676,12 +876,18 @@ Items: {:,.0f} - {:,.0f} \tSplit time: {} \tTotal time: {}\
                     and seconds if hms is True and will receive one input of 
                     seconds if hms is False
         """
-        if form is None:
-            if long:
-                form = "%A %B %d, %Y %H:%M:%S"
+        if form is None and not long:
+            # Reuse the last default report if still within the same second
+            sec = int(time.time())
+            if _now_cache[0] == sec:
+                res = _now_cache[1]
             else:
-                form = "%Y-%m-%d %H:%M:%S"
-        res = time.strftime(form)
+                res = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(sec))
+                _now_cache[:] = sec, res
+        else:
+            if form is None:
+                form = "%A %B %d, %Y %H:%M:%S"
+            res = time.strftime(form)
         if printit:
             print(res)
         else:
@@ -787,46 +993,141 @@ Items: {:,.0f} - {:,.0f} \tSplit time: {} \tTotal time: {}\
                             text.format(*fmts, **kwargs)
         print(text)
 
-    def _report(self, delta, printit=False, **kwargs):
+    def _report(self, delta, printit=False, numeric=None, hms=None, form=None,
+                *, _print=print, **kwargs):
         """
-        Report the given amount of seconds elapsed in the stopwatch's chosen
-        or default format.
+        Report the given amount of time elapsed, in the units of the timing 
+        function, in the stopwatch's chosen or default format. Formatting info 
+        which is not provided defaults to that of the stopwatch; other keyword 
+        arguments are ignored.
         """
-        # Get formatting info
-        numeric = kwargs.get('numeric', self.numeric)
-        hms = kwargs.get('hms', self.hms)
-        form = kwargs.get('form', self.form)
-        
-        # If a report process is given, apply
-        if not self.process is None:
-            res = self.process(delta)
-        # If numeric report requested, apply
-        if numeric:
-            # If hour-minute-second disaggregation requested, apply
-            if hms:
-                res = s_to_hms(delta)
-            else:
-                res = delta
-        # If formatted report requested (else), apply
+        # Use the compiled reporter if no formatting info is provided
+        if numeric is None and hms is None and form is None:
+            res = self._reporter(delta)
         else:
-            # If hour-minute-second disaggregation requested, apply
-            if hms:
-                try:
-                    res = form.format(*s_to_hms(delta))
-                except IndexError:
-                    raise ValueError("Invalid formatting string.")
-            else:
-                try:
-                    res = form.format(delta)
-                except IndexError:
-                    raise ValueError("Invalid formatting string.")
+            res = self._report_slow(delta / self._unit, numeric=numeric,
+                                    hms=hms, form=form)
         
         # Return or print the result
         if printit:
-            print(res)
-            return None
+            _print(res)
+            return
+        return res
+    
+    def _report_slow(self, delta, numeric=None, hms=None, form=None):
+        """
+        Report the given amount of seconds elapsed, resolving the given 
+        formatting info against that of the stopwatch.
+        """
+        # Get formatting info
+        if numeric is None:
+            numeric = self._numeric
+        if hms is None:
+            hms = self._hms
+        if form is None:
+            form = self._form
+        
+        # If a report process is given, apply in place of formatting
+        if self._has_process:
+            return self._process(delta)
+        # Format the result
+        return _format_delta(delta, numeric, hms, form)
+    
+    def _compile_reporter(self):
+        """
+        Generate a reporting function specialized to the stopwatch's 
+        reporting format, taking time values in the units of the timing 
+        function and avoiding the resolution of formatting info on each 
+        report.
+        """
+        self._has_process = not self._process is None
+        if self._has_process:
+            reporter = _build_reporter(
+                "return _process(delta / _unit)",
+                _unit=self._unit, _process=self._process)
         else:
-            return res
+            reporter = _format_reporter(self._numeric, self._hms, self._form, 
+                                        self._unit)
+        self._reporter = reporter
+        
+        
+class _TimedLoopIter(object):
+    """
+    Iterator driving the Stopwatch.timed_loop method, logging each chunk of 
+    iterated items as a lap and stopping once the expiration timer runs out. 
+    Chunking, lap logging, and expiration checks are handled in a single 
+    iterator rather than through nested generators.
+    """
+    __slots__ = ('sw', 'it', 'every', 'timer', 'cutoff_fn', 'report', 
+                 '_iterable', '_i', '_j', '_done')
+    
+    def __init__(self, sw, iterable, every, timer, cutoff_fn=None, 
+                 report=False):
+        self.sw = sw
+        self.it = None
+        self.every = every
+        self.timer = timer
+        self.cutoff_fn = cutoff_fn
+        self.report = report
+        self._iterable = iterable
+        self._i = -1 # Index of the last yielded item
+        self._j = every # Number of items yielded in the current chunk
+        self._done = False
+        
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        if self._done:
+            raise StopIteration
+        sw = self.sw
+        
+        # Start the loop timer on the first iteration
+        if self.it is None:
+            sw._begin_loop(self._iterable, self.every, self.report)
+            self.it = iter(self._iterable)
+        
+        # Check for expiration after the first item of each chunk
+        elif self._j == 1:
+            elapsed = sw._check_numeric()
+            if self.cutoff_fn is None:
+                if elapsed / sw._unit >= self.timer:
+                    sw._break_loop = True
+            # Check if there is time for another lap before expiration
+            elif (elapsed + self.cutoff_fn() * self.every) / sw._unit > \
+                    self.timer:
+                sw._break_loop = True
+        
+        # Stop early if requested
+        if sw._break_loop:
+            self._finish()
+            raise StopIteration
+        
+        # Log the completed chunk and begin the next one
+        if self._j == self.every:
+            if self._i >= 0:
+                sw._end_chunk(self._i - self._j + 2, self._i + 1, self.report)
+            sw.start()
+            self._j = 0
+        
+        # Yield next value
+        try:
+            x = next(self.it)
+        except StopIteration:
+            self._finish()
+            raise
+        self._i += 1
+        self._j += 1
+        return x
+    
+    def _finish(self):
+        """
+        Log the partial chunk of items, if any, and close the loop timer.
+        """
+        self._done = True
+        if self._j > 0:
+            self.sw._end_chunk(self._i - self._j + 2, self._i + 1, self.report)
+        if self.report: print("End loop timer.")
         
         
 ########################
@@ -834,6 +1135,197 @@ Items: {:,.0f} - {:,.0f} \tSplit time: {} \tTotal time: {}\
 ########################
 
 
+def _format_delta(delta, numeric, hms, form, _divmod=divmod):
+    """
+    Format the given amount of seconds elapsed according to the given 
+    reporting parameters.
+    """
+    # If numeric report requested, apply
+    if numeric:
+        # If hour-minute-second disaggregation requested, apply
+        if hms:
+            m, s = _divmod(delta, 60)
+            h, m = _divmod(m, 60)
+            return h, m, s
+        else:
+            return delta
+    # If formatted report requested (else), apply
+    else:
+        # If hour-minute-second disaggregation requested, apply
+        if hms:
+            m, s = _divmod(delta, 60)
+            h, m = _divmod(m, 60)
+            return _format_checked(_compile_form(form), h, m, s)
+        else:
+            return _format_checked(_compile_form(form), delta)
+
+def _build_reporter(body, **names):
+    """
+    Generate a reporting function of a single time value, `delta`, from the 
+    given source code body. The given names are made available to the body as 
+    default arguments of the function so that they are read as local 
+    variables.
+    """
+    return FunctionType(_reporter_code(body, tuple(names)), globals(), 
+                        'reporter', tuple(names.values()))
+
+@lru_cache(maxsize=128)
+def _reporter_code(body, names):
+    """
+    Compile the code of a reporting function from the given source code body 
+    and default argument names. Compiled code is cached, so reporters built 
+    from the same source are only compiled once.
+    """
+    args = ''.join(', {0}={0}'.format(name) for name in names)
+    source = 'def reporter(delta{}):\n    {}'.format(
+        args, body.replace('\n', '\n    '))
+    namespace = dict.fromkeys(names)
+    exec(source, namespace)
+    return namespace['reporter'].__code__
+
+@lru_cache(maxsize=128)
+def _format_reporter(numeric, hms, form, unit):
+    """
+    Generate a reporting function for the given reporting format, taking time 
+    values in the given units of the timing function. Reporters are cached, so 
+    stopwatches using the same reporting format share one reporter.
+    """
+    if numeric:
+        if hms:
+            reporter = _build_reporter(
+                "m, s = _divmod(delta / _unit, 60)\n"
+                "h, m = _divmod(m, 60)\n"
+                "return h, m, s",
+                _unit=unit, _divmod=divmod)
+        else:
+            reporter = _build_reporter(
+                "return delta / _unit",
+                _unit=unit)
+    else:
+        fmt = _compile_form(form)
+        # Split hours, minutes and seconds in place rather than building and 
+        # unpacking a tuple on each report
+        if hms:
+            body = ("m, s = _divmod(delta / _unit, 60)\n"
+                    "h, m = _divmod(m, 60)\n")
+            args = ('h', 'm', 's')
+        else:
+            body = "d = delta / _unit\n"
+            args = ('d',)
+        # Validate the formatting string once rather than on each report; 
+        # invalid strings raise their errors when used, not when set
+        try:
+            fmt(*[0.0] * len(args))
+        except Exception:
+            source = "_format_checked(_fmt, {})".format(', '.join(args))
+        else:
+            # Inline the f-string into the reporter where possible
+            source = _form_source(form, args) or \
+                "_fmt({})".format(', '.join(args))
+        reporter = _build_reporter(
+            body + "return " + source,
+            _unit=unit, _fmt=fmt, _divmod=divmod, 
+            _format_checked=_format_checked)
+    return reporter
+
+def _format_checked(fmt, *values):
+    """
+    Format the given values with the given compiled formatting string, 
+    reporting strings with too few fields for the values as invalid.
+    """
+    try:
+        return fmt(*values)
+    except IndexError:
+        raise ValueError("Invalid formatting string.")
+
+@lru_cache(maxsize=128)
+def _compile_form(form):
+    """
+    Compile the given formatting string into a function of positional values 
+    which is equivalent to the string's format method, but which is built as 
+    an f-string so that the formatting string is only parsed once. Formatting 
+    strings with fields other than plain positional indexes fall back to the 
+    string's format method. Compiled functions are cached, so stopwatches 
+    using the same formatting string share one compiled function.
+    """
+    source = _form_source(form)
+    if source is None:
+        return form.format
+    return eval('lambda *args: ' + source, {})
+
+def _form_source(form, names=None):
+    """
+    Translate the given formatting string into the source of an equivalent 
+    f-string expression. Fields refer to the given sequence of variable names 
+    by position or, if no names are given, to items of a tuple named args. 
+    Returns None if the formatting string cannot be translated, including 
+    when a field refers past the end of the given names.
+    """
+    code = []
+    auto = manual = 0
+    try:
+        for literal, field, spec, conv in Formatter().parse(form):
+            # Escape literal text for use in an f-string
+            code.append(literal.replace('{', '{{').replace('}', '}}'))
+            if field is None:
+                continue
+            # Resolve the positional index of the field
+            if field == '':
+                index = auto
+                auto += 1
+            elif field.isdigit():
+                index = int(field)
+                manual += 1
+            else:
+                return None
+            # Nested fields, escapes, and unknown conversions are left to the 
+            # format method
+            if any(c in spec for c in '{}\\\'"') or \
+                    not conv in (None, 'r', 's', 'a'):
+                return None
+            if names is None:
+                name = 'args[{}]'.format(index)
+            elif index < len(names):
+                name = names[index]
+            else:
+                return None
+            code.append('{{{}{}{}}}'.format(
+                name, '' if conv is None else '!' + conv,
+                '' if not spec else ':' + spec))
+    except ValueError:
+        return None
+    # Mixed automatic and manual numbering is left to the format method
+    if auto and manual:
+        return None
+    return 'f' + repr(''.join(code))
+
+def _chunk_size(every):
+    """
+    Validate the given number of items per loop chunk, defaulting to 1.
+    """
+    if every is None:
+        every = 1
+    else:
+        try:
+            every = int(every)
+            if every < 1:
+                raise ValueError("The 'every' parameter must be > 0")
+        except:
+            raise TypeError("The 'every' parameter must be an integer")
+    return every
+
+def _ichunks(iterable, size):
+    """
+    Lazily yield tuples of up to the given number of items from the input 
+    iterable.
+    """
+    it = iter(iterable)
+    while True:
+        chunk = tuple(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
 def stopwatch(numeric=False, hms=True, form=None):
     """
     Creates a Stopwatch object based on the input parameters and returns a 
@@ -857,44 +1349,136 @@ def stopwatch(numeric=False, hms=True, form=None):
     Returns
     -------
     a stopwatch object, initialized using the given parameters
+    
+    Notes
+    -----
+    Each call returns the check function of a fresh stopwatch, since timing 
+    starts when the stopwatch is created. The reporter compiled for the 
+    given parameters is cached and shared between calls with the same 
+    parameters; use stopwatch.cache_clear() to clear cached reporters and 
+    conversions.
     """
     obj = Stopwatch(numeric=numeric, hms=hms, form=form)
     return obj.check
 
+def _cache_clear():
+    """
+    Clear the caches of compiled reporters, formatting strings, and 
+    whole-second conversions.
+    """
+    _format_reporter.cache_clear()
+    _reporter_code.cache_clear()
+    _compile_form.cache_clear()
+    _s_to_hms_int.cache_clear()
+
+stopwatch.cache_clear = _cache_clear
+
 def timed_loop(iterable=None, s=0, m=0, h=0, **kwargs):
     """
     """
     sw = Stopwatch()
     return sw.timed_loop(iterable=iterable, s=s, m=m, h=h, **kwargs)
 
+def report_many(deltas, numeric=False, hms=True, form=None):
+    """
+    Report many amounts of seconds elapsed at once, such as lap times 
+    collected for post-processing. Numeric arrays supporting elementwise 
+    arithmetic (e.g., NumPy arrays) are converted to hours, minutes, and 
+    seconds in a single call; other iterables are converted item by item.
+
+    Parameters
+    ----------
+    :deltas:    `iterable or numeric array` amounts of seconds elapsed to 
+                report
+    :numeric:   `boolean` whether to report time values numerically or with a 
+                formatted string
+    :hms:       `boolean` whether to report time values in terms of hours, 
+                minutes, and seconds
+    :form:      `string` a formatting string to use when reporting time values
+                as a formatted string (ignored if numeric is True); the string
+                will receive three inputs of hours, minutes, and seconds if
+                hms is True and will receive one input of seconds if hms is
+                False
+    
+    Returns
+    -------
+    if numeric and hms are True, a tuple of hours, minutes, and seconds 
+    sequences; if numeric is True and hms is False, the input deltas; 
+    otherwise, a list of formatted strings
+    """
+    # Report seconds without hour-minute-second disaggregation
+    if not hms:
+        if numeric:
+            return deltas
+        fmt = _compile_form(Stopwatch._form_s if form is None else form)
+        try:
+            return [fmt(delta) for delta in deltas]
+        except IndexError:
+            raise ValueError("Invalid formatting string.")
+    
+    # Disaggregate hours, minutes, and seconds, elementwise for arrays
+    try:
+        h, m, s = s_to_hms(deltas)
+    except TypeError:
+        h, m, s = [], [], []
+        for delta in deltas:
+            m_, s_ = divmod(delta, 60)
+            h_, m_ = divmod(m_, 60)
+            h.append(h_)
+            m.append(m_)
+            s.append(s_)
+    if numeric:
+        return h, m, s
+    fmt = _compile_form(Stopwatch._form_hms if form is None else form)
+    try:
+        return [fmt(*values) for values in zip(h, m, s)]
+    except IndexError:
+        raise ValueError("Invalid formatting string.")
+
 def s_to_hms(s):
     """
     Convert a number of seconds into a three-number tuple of hours, minutes, 
-    and seconds.
+    and seconds. Numeric arrays supporting elementwise arithmetic (e.g., NumPy 
+    arrays) are converted elementwise in a single call, returning a tuple of 
+    arrays.
 
     Parameters
     ----------
-    :seconds:   `numeric` number of seconds to convert to hours, minutes, and
-                seconds
+    :seconds:   `numeric or numeric array` number of seconds to convert to 
+                hours, minutes, and seconds
     
     Returns
     -------
     a tuple of hours, minutes, and seconds
     """
-    h = s // 3600
-    m = (s % 3600) // 60
-    s = s % 60
+    # Reuse conversions of whole numbers of seconds, which commonly recur
+    if type(s) is int:
+        return _s_to_hms_int(s)
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
+    return h, m, s
+
+@lru_cache(maxsize=4096)
+def _s_to_hms_int(s):
+    """
+    Convert a whole number of seconds into a three-number tuple of hours, 
+    minutes, and seconds, caching results.
+    """
+    m, s = divmod(s, 60)
+    h, m = divmod(m, 60)
     return h, m, s
 
 def hms_to_s(h, m, s):
     """
-    Convert numbers of hours, minutes, and seconds into a number of seconds.
+    Convert numbers of hours, minutes, and seconds into a number of seconds. 
+    Numeric arrays supporting elementwise arithmetic (e.g., NumPy arrays) are 
+    converted elementwise in a single call.
 
     Parameters
     ----------
-    :h:     `numeric` number of hours to convert to seconds
-    :m:     `numeric` number of minutes to convert to seconds
-    :s:     `numeric` number of seconds
+    :h:     `numeric or numeric array` number of hours to convert to seconds
+    :m:     `numeric or numeric array` number of minutes to convert to seconds
+    :s:     `numeric or numeric array` number of seconds
     
     Returns
     -------